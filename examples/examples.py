@@ -2,6 +2,8 @@
 Python library pymcp usage examples
 """
 
+import math
+
 from pymcp import PyMCP, convert_function, mcpwrap
 
 
@@ -59,9 +61,7 @@ def square(x: int) -> int:
 @math_server.wrap_function()
 def factorial(n: int) -> int:
     """Calculate factorial"""
-    if n <= 1:
-        return 1
-    return n * factorial(n - 1)
+    return math.factorial(n)
 
 # You can run the server with:
 # math_server.run()
@@ -6,10 +6,16 @@ Example script showing LangChain and GPT-4o-mini integration with PyMCP
 import os
 import sys
 import signal
-import time
-from typing import Optional, Dict, Any
+import asyncio
+import logging
+import importlib.util
+from typing import Optional, Dict, Any, List, Set, Tuple, AsyncIterator
+import httpx
 from pymcp import PyMCP, mcpwrap
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 
@@ -19,6 +25,54 @@ load_dotenv()
 # Global variable to track server state
 server_running = True
 
+# Request-path logging goes through this logger; main() enables DEBUG output
+# together with PyMCP's debug mode
+logger = logging.getLogger("pymcp.examples")
+
+# Cache LLM responses so repeated prompts are answered without calling OpenAI.
+# The cache key includes the model parameters (model name, temperature, ...).
+# It is bounded so a long-running server doesn't keep every distinct prompt forever.
+LLM_CACHE_SIZE = 1024
+set_llm_cache(InMemoryCache(maxsize=LLM_CACHE_SIZE))
+
+# Pace OpenAI requests to stay under the account's requests-per-minute quota
+# (override with OPENAI_RPM) instead of backing off after 429 responses
+DEFAULT_OPENAI_RPM = 500
+
+def read_openai_rpm() -> int:
+    """Read OPENAI_RPM, falling back to the default unless it is a positive integer"""
+    value = os.environ.get("OPENAI_RPM")
+    if value is None:
+        return DEFAULT_OPENAI_RPM
+    try:
+        rpm = int(value)
+    except ValueError:
+        rpm = 0
+    if rpm <= 0:
+        # A rate of zero or less would never grant a request and hang every tool call
+        logger.warning("Invalid OPENAI_RPM %r; using %d", value, DEFAULT_OPENAI_RPM)
+        return DEFAULT_OPENAI_RPM
+    return rpm
+
+OPENAI_RPM = read_openai_rpm()
+RATE_LIMITER = InMemoryRateLimiter(
+    requests_per_second=OPENAI_RPM / 60,
+    check_every_n_seconds=0.05,
+    max_bucket_size=16,
+)
+
+# One HTTP connection pool shared by every ChatOpenAI instance; with h2 installed,
+# HTTP/2 multiplexes concurrent OpenAI requests over a single connection
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+SHARED_HTTP_CLIENT = httpx.Client(http2=HTTP2_ENABLED, limits=HTTP_LIMITS, timeout=60)
+SHARED_ASYNC_HTTP_CLIENT = httpx.AsyncClient(http2=HTTP2_ENABLED, limits=HTTP_LIMITS, timeout=60)
+
+# Micro-batching settings: tool calls arriving within BATCH_WINDOW seconds
+# of each other are sent to OpenAI as a single chain.abatch() call
+MAX_BATCH = 16
+BATCH_WINDOW = 0.02
+
 # =================================================================
 # API 키 설정 방법:
 # 1. .env 파일을 생성하고 다음 내용 추가: OPENAI_API_KEY=your-api-key-here
@@ -33,13 +87,21 @@ def signal_handler(sig, frame):
     global server_running
     print("\nShutting down server gracefully...")
     server_running = False
-    time.sleep(1)
     sys.exit(0)
 
 # Register signal handlers
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
+def install_uvloop() -> bool:
+    """Use uvloop as the asyncio event loop if it is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 def setup_openai_api():
     """Set up and verify OpenAI API key"""
     api_key = os.environ.get("OPENAI_API_KEY")
@@ -65,39 +127,127 @@ def create_model():
             temperature=0.7,
             api_key=api_key,
             timeout=60,
-            max_retries=3
+            max_retries=3,
+            rate_limiter=RATE_LIMITER,
+            http_client=SHARED_HTTP_CLIENT,
+            http_async_client=SHARED_ASYNC_HTTP_CLIENT
         )
     except Exception as e:
         print(f"OpenAI 모델 생성 오류: {str(e)}")
         return None
 
-def safe_invoke(chain, inputs: Dict[str, Any]) -> Optional[str]:
-    """Safely invoke a LangChain chain with error handling"""
+class ChainBatcher:
+    """Coalesce concurrent invocations of a LangChain chain into abatch() calls"""
+
+    def __init__(self, chain, max_batch: int = MAX_BATCH, window: float = BATCH_WINDOW):
+        self.chain = chain
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # In-flight batches; the event loop only keeps weak references to tasks
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def invoke(self, inputs: Dict[str, Any]) -> Any:
+        """Queue inputs for the next batch and wait for their result"""
+        # The queue and worker are created lazily so they bind to the server's event loop
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((inputs, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue into batches and dispatch each one without waiting for it"""
+        while True:
+            batch: List[Tuple[Dict[str, Any], asyncio.Future]] = [await self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=self.window))
+                except asyncio.TimeoutError:
+                    break
+
+            # Calls arriving while this batch is in flight start the next one right away
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Run one batch through the chain and fan results back to the waiting callers"""
+        inputs = [item for item, _ in batch]
+        try:
+            if len(inputs) == 1:
+                # A lone call goes straight through ainvoke without the batch machinery
+                results = [await self.chain.ainvoke(inputs[0])]
+            else:
+                results = await self.chain.abatch(
+                    inputs,
+                    config={"max_concurrency": self.max_batch},
+                    return_exceptions=True,
+                )
+        except BaseException as e:
+            # Fail every caller, including on cancellation, so none of them waits forever
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+async def safe_invoke(batcher: ChainBatcher, inputs: Dict[str, Any]) -> Optional[str]:
+    """Safely invoke a LangChain chain through its batcher with error handling"""
     try:
-        result = chain.invoke(inputs)
+        result = await batcher.invoke(inputs)
         return result.content
     except Exception as e:
         error_msg = f"LangChain 호출 오류: {str(e)}"
-        print(error_msg)
+        logger.error(error_msg)
         return f"죄송합니다, 오류가 발생했습니다: {error_msg}"
 
+async def safe_stream(chain, inputs: Dict[str, Any]) -> AsyncIterator[str]:
+    """Safely stream a LangChain chain's output chunk by chunk with error handling"""
+    try:
+        async for chunk in chain.astream(inputs):
+            yield chunk.content
+    except Exception as e:
+        error_msg = f"LangChain 호출 오류: {str(e)}"
+        logger.error(error_msg)
+        yield f"죄송합니다, 오류가 발생했습니다: {error_msg}"
+
 def main():
     """Set up and run a PyMCP server with LangChain and GPT-4o-mini."""
     print("\n============================================")
     print("LangChain GPT-4o-mini MCP 서버 시작 중...")
     print("============================================\n")
+
+    # Switch to uvloop before any model or event loop is created
+    if install_uvloop():
+        print("uvloop 이벤트 루프를 사용합니다")
     
     # Check for OpenAI API key or prompt the user
     if not setup_openai_api():
         return
 
+    # Debug mode turns on verbose PyMCP logs and the example's per-call debug logging
+    debug = True
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+
     # Create a PyMCP server with more robust error handling
     try:
         print("PyMCP 서버 생성 중...")
         server = PyMCP(
             name="LangChain GPT-4o-mini Server",
             instructions="This is a server that uses LangChain with GPT-4o-mini model. Available tools are for generating jokes, explaining concepts, and summarizing text.",
-            debug=True,  # Enable debug mode for more verbose logs
+            debug=debug,  # Enable debug mode for more verbose logs
         )
         print("PyMCP 서버 생성 완료!")
     except Exception as e:
@@ -131,29 +281,36 @@ def main():
     summary_chain = summary_prompt | model
     print("프롬프트 템플릿 생성 완료!")
 
+    joke_batcher = ChainBatcher(joke_chain)
+    explain_batcher = ChainBatcher(explain_chain)
+
     @server.wrap_function(name="generate_joke", description="Generate a joke about a given topic")
-    def generate_joke(topic: str) -> str:
+    async def generate_joke(topic: str) -> str:
         """Generate a joke about the given topic."""
-        print(f"'generate_joke' 함수 호출됨: topic={topic}")
-        result = safe_invoke(joke_chain, {"topic": topic})
-        print(f"'generate_joke' 함수 결과: {result[:30]}...")
+        logger.debug("'generate_joke' 함수 호출됨: topic=%s", topic)
+        result = await safe_invoke(joke_batcher, {"topic": topic})
+        logger.debug("'generate_joke' 함수 결과: %s...", result[:30])
         return result
 
     @server.wrap_function(name="explain_concept", description="Explain a concept in simple terms")
-    def explain_concept(concept: str) -> str:
+    async def explain_concept(concept: str) -> str:
         """Explain a concept in simple terms."""
-        print(f"'explain_concept' 함수 호출됨: concept={concept}")
-        result = safe_invoke(explain_chain, {"concept": concept})
-        print(f"'explain_concept' 함수 결과: {result[:30]}...")
+        logger.debug("'explain_concept' 함수 호출됨: concept=%s", concept)
+        result = await safe_invoke(explain_batcher, {"concept": concept})
+        logger.debug("'explain_concept' 함수 결과: %s...", result[:30])
         return result
 
     @server.wrap_function(name="summarize_text", description="Summarize the provided text")
-    def summarize_text(text: str) -> str:
+    async def summarize_text(text: str) -> AsyncIterator[str]:
         """Summarize the provided text."""
-        print(f"'summarize_text' 함수 호출됨: text={text[:30]}...")
-        result = safe_invoke(summary_chain, {"text": text})
-        print(f"'summarize_text' 함수 결과: {result[:30]}...")
-        return result
+        logger.debug("'summarize_text' 함수 호출됨: text=%s...", text[:30])
+        # Summaries are long, so they are streamed rather than batched: PyMCP forwards
+        # each chunk to the client as a progress notification while OpenAI generates it
+        size = 0
+        async for chunk in safe_stream(summary_chain, {"text": text}):
+            size += len(chunk)
+            yield chunk
+        logger.debug("'summarize_text' 함수 완료: %d자", size)
 
     print("\nLangChain GPT-4o-mini MCP 서버가 시작되었습니다!")
     print("사용 가능한 도구:")
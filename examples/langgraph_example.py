@@ -6,21 +6,75 @@ Example script showing LangGraph and GPT-4o-mini integration with PyMCP
 import os
 import sys
 import json
+import re
 import signal
-import time
+import asyncio
+import logging
+import importlib.util
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
+import httpx
 from pymcp import PyMCP
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
 from dotenv import load_dotenv
 
+# Use orjson for faster JSON parsing when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Quoted strings in model output, used when the entity list isn't valid JSON
+_ENTITY_RE = re.compile(r'"([^"]+)"')
+
 # 현재 디렉토리의 .env 파일 로드
 load_dotenv()
 
 # Global variable to track server state
 server_running = True
 
+# Request-path logging goes through this logger; main() enables DEBUG output
+# together with PyMCP's debug mode
+logger = logging.getLogger("pymcp.examples")
+
+# Pace OpenAI requests to stay under the account's requests-per-minute quota
+# (override with OPENAI_RPM) instead of backing off after 429 responses
+DEFAULT_OPENAI_RPM = 500
+
+def read_openai_rpm() -> int:
+    """Read OPENAI_RPM, falling back to the default unless it is a positive integer"""
+    value = os.environ.get("OPENAI_RPM")
+    if value is None:
+        return DEFAULT_OPENAI_RPM
+    try:
+        rpm = int(value)
+    except ValueError:
+        rpm = 0
+    if rpm <= 0:
+        # A rate of zero or less would never grant a request and hang every tool call
+        logger.warning("Invalid OPENAI_RPM %r; using %d", value, DEFAULT_OPENAI_RPM)
+        return DEFAULT_OPENAI_RPM
+    return rpm
+
+OPENAI_RPM = read_openai_rpm()
+RATE_LIMITER = InMemoryRateLimiter(
+    requests_per_second=OPENAI_RPM / 60,
+    check_every_n_seconds=0.05,
+    max_bucket_size=16,
+)
+
+# One HTTP connection pool shared by every ChatOpenAI instance; with h2 installed,
+# HTTP/2 multiplexes concurrent OpenAI requests over a single connection
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50)
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+SHARED_HTTP_CLIENT = httpx.Client(http2=HTTP2_ENABLED, limits=HTTP_LIMITS, timeout=60)
+SHARED_ASYNC_HTTP_CLIENT = httpx.AsyncClient(http2=HTTP2_ENABLED, limits=HTTP_LIMITS, timeout=60)
+
 # =================================================================
 # API 키 설정 방법:
 # 1. .env 파일을 생성하고 다음 내용 추가: OPENAI_API_KEY=your-api-key-here
@@ -30,41 +84,30 @@ server_running = True
 # os.environ["OPENAI_API_KEY"] = "your-api-key-here"
 # =================================================================
 
+# Read once at import so the workflow nodes don't query the environment on every call
+_API_KEY = os.environ.get("OPENAI_API_KEY")
+
 def signal_handler(sig, frame):
     """Handle interrupt signals gracefully"""
     global server_running
     print("\nShutting down server gracefully...")
     server_running = False
-    time.sleep(1)
     sys.exit(0)
 
 # Register signal handlers
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
+@dataclass(slots=True)
 class State:
     """State object for the research workflow."""
-    def __init__(self, query: str = ""):
-        self.query = query
-        self.entities: List[str] = []
-        self.information: Dict[str, str] = {}
-        self.response: str = ""
+    query: str = ""
+    entities: List[str] = field(default_factory=list)
+    information: Dict[str, str] = field(default_factory=dict)
+    response: str = ""
 
-def extract_entities(state: State) -> State:
-    """Extract key entities from the user query."""
-    try:
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY를 찾을 수 없습니다")
-        
-        print(f"extract_entities 함수 실행 중 - 쿼리: {state.query[:30]}...")
-        model = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3,
-            timeout=60,
-            max_retries=3
-        )
-        prompt = ChatPromptTemplate.from_template("""
+# Prompt templates are parsed once at import instead of on every node call
+EXTRACT_PROMPT = ChatPromptTemplate.from_template("""
         Extract the key entities/topics that need to be researched from the query.
         Return ONLY a JSON array of strings with no explanation.
 
@@ -72,122 +115,195 @@ def extract_entities(state: State) -> State:
         
         JSON Array:
         """)
+
+LOOKUP_PROMPT = ChatPromptTemplate.from_template("""
+        Provide a concise summary of information about: {entity}
+        Focus only on the most important facts and keep it to 2-3 sentences.
+        """)
+
+RESPONSE_PROMPT = ChatPromptTemplate.from_template("""
+        Based on the following information, provide a comprehensive response to the query.
+        Make sure to address all aspects of the query and integrate the information seamlessly.
         
-        chain = prompt | model
+        INFORMATION:
+        {context}
+        
+        QUERY:
+        {query}
+        
+        RESPONSE:
+        """)
+
+# Single-call variant of the workflow: entities, facts and response in one reply
+FAST_RESEARCH_PROMPT = ChatPromptTemplate.from_template("""
+        Answer the research query below in a single reply with exactly these Markdown sections:
+        
+        ## Entities
+        The key entities/topics in the query, one per line.
+        
+        ## Facts
+        The most important facts about each entity, 2-3 sentences per entity.
         
-        result = chain.invoke({"query": state.query})
+        ## Response
+        A comprehensive response to the query that integrates the facts above.
+        
+        QUERY:
+        {query}
+        """)
+
+# "## Heading" lines that split the fast research reply into sections; the
+# headings may be indented, as they are in the prompt template
+_SECTION_RE = re.compile(r"^[ \t]*##[ \t]*(Entities|Facts|Response)[ \t]*$", re.MULTILINE | re.IGNORECASE)
+
+@functools.lru_cache(maxsize=None)
+def get_model(temperature: float) -> ChatOpenAI:
+    """Return a shared GPT-4o-mini model so its HTTP connection pool is reused across calls"""
+    if not _API_KEY:
+        raise ValueError("OPENAI_API_KEY를 찾을 수 없습니다")
+    return ChatOpenAI(
+        model="gpt-4o-mini", 
+        temperature=temperature,
+        api_key=_API_KEY,
+        timeout=60,
+        max_retries=3,
+        rate_limiter=RATE_LIMITER,
+        http_client=SHARED_HTTP_CLIENT,
+        http_async_client=SHARED_ASYNC_HTTP_CLIENT
+    )
+
+# Prompt and model temperature for each node's chain
+CHAIN_SPECS = {
+    "extract": (EXTRACT_PROMPT, 0.3),
+    "lookup": (LOOKUP_PROMPT, 0.3),
+    "response": (RESPONSE_PROMPT, 0.5),
+    "fast": (FAST_RESEARCH_PROMPT, 0.5),
+}
+
+@functools.lru_cache(maxsize=None)
+def get_chain(name: str):
+    """Return the prompt | model chain for a node, composed only once"""
+    prompt, temperature = CHAIN_SPECS[name]
+    return prompt | get_model(temperature)
+
+# Entity summaries already fetched in this process, most recently used last
+LOOKUP_CACHE_SIZE = 1024
+_lookup_cache: "OrderedDict[str, str]" = OrderedDict()
+
+def get_cached_lookup(entity: str) -> Optional[str]:
+    """Return a cached entity summary, marking it as recently used"""
+    info = _lookup_cache.get(entity)
+    if info is not None:
+        _lookup_cache.move_to_end(entity)
+    return info
+
+def cache_lookup(entity: str, info: str) -> None:
+    """Cache an entity summary, evicting the least recently used entry when full"""
+    _lookup_cache[entity] = info
+    _lookup_cache.move_to_end(entity)
+    if len(_lookup_cache) > LOOKUP_CACHE_SIZE:
+        _lookup_cache.popitem(last=False)
+
+async def extract_entities(state: State) -> State:
+    """Extract key entities from the user query."""
+    try:
+        logger.debug("extract_entities 함수 실행 중 - 쿼리: %s...", state.query[:30])
+        result = await get_chain("extract").ainvoke({"query": state.query})
+        # Strip Markdown code fences the model may wrap around the JSON
+        content = result.content.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
         # Process the JSON string to get a list of entities
         try:
-            entities = json.loads(result.content)
+            entities = json_loads(content)
             if not isinstance(entities, list):
                 entities = [entities]
         except:
             # Fallback if JSON parsing fails
-            entities = [e.strip() for e in result.content.strip("[]").split(",")]
+            entities = _ENTITY_RE.findall(content) or [content]
         
         state.entities = entities
-        print(f"추출된 엔티티: {entities}")
+        logger.debug("추출된 엔티티: %s", entities)
     except Exception as e:
-        print(f"extract_entities 함수 오류: {str(e)}")
+        logger.error("extract_entities 함수 오류: %s", e)
         # Fallback to a generic entity if extraction fails
         state.entities = ["general information"]
-        print(f"기본 엔티티로 대체: {state.entities}")
+        logger.debug("기본 엔티티로 대체: %s", state.entities)
     
     return state
 
-def lookup_info(state: State) -> State:
+async def lookup_info(state: State) -> State:
     """Look up information about the extracted entities."""
     try:
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY를 찾을 수 없습니다")
-        
-        print(f"lookup_info 함수 실행 중 - 엔티티: {state.entities}")
-        model = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3,
-            timeout=60,
-            max_retries=3
-        )
-        prompt = ChatPromptTemplate.from_template("""
-        Provide a concise summary of information about: {entity}
-        Focus only on the most important facts and keep it to 2-3 sentences.
-        """)
-        
-        chain = prompt | model
-        
+        logger.debug("lookup_info 함수 실행 중 - 엔티티: %s", state.entities)
         info = {}
-        for entity in state.entities:
-            try:
-                print(f"정보 검색 중: {entity}")
-                result = chain.invoke({"entity": entity})
-                info[entity] = result.content
-                print(f"정보 검색 결과 ({entity}): {result.content[:30]}...")
-            except Exception as e:
-                print(f"{entity} 정보 검색 오류: {str(e)}")
-                info[entity] = f"{entity}에 대한 정보를 현재 사용할 수 없습니다."
+        missing = []
+        for entity in dict.fromkeys(state.entities):
+            cached = get_cached_lookup(entity)
+            if cached is None:
+                missing.append(entity)
+            else:
+                info[entity] = cached
         
-        state.information = info
+        # Look up uncached entities concurrently; a failed lookup doesn't affect the others
+        if missing:
+            logger.debug("정보 검색 중: %s", missing)
+            results = await get_chain("lookup").abatch(
+                [{"entity": entity} for entity in missing],
+                config={"max_concurrency": 8},
+                return_exceptions=True,
+            )
+            for entity, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    logger.error("%s 정보 검색 오류: %s", entity, result)
+                    info[entity] = f"{entity}에 대한 정보를 현재 사용할 수 없습니다."
+                else:
+                    info[entity] = result.content
+                    cache_lookup(entity, result.content)
+                    logger.debug("정보 검색 결과 (%s): %s...", entity, result.content[:30])
+        
+        state.information = {entity: info[entity] for entity in state.entities}
     except Exception as e:
-        print(f"lookup_info 함수 오류: {str(e)}")
+        logger.error("lookup_info 함수 오류: %s", e)
         # Set fallback information
         state.information = {entity: f"{entity}에 대한 정보를 검색할 수 없습니다." 
                             for entity in state.entities}
     
     return state
 
-def generate_response(state: State) -> State:
+async def generate_response(state: State) -> State:
     """Generate a final response based on the information gathered."""
     try:
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY를 찾을 수 없습니다")
-        
-        print(f"generate_response 함수 실행 중 - 정보 수집 완료")
-        model = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.5,
-            timeout=60,
-            max_retries=3
-        )
+        logger.debug("generate_response 함수 실행 중 - 정보 수집 완료")
         
         # Create context from the information gathered
         context = ""
         for entity, info in state.information.items():
             context += f"{entity}: {info}\n\n"
         
-        prompt = ChatPromptTemplate.from_template("""
-        Based on the following information, provide a comprehensive response to the query.
-        Make sure to address all aspects of the query and integrate the information seamlessly.
-        
-        INFORMATION:
-        {context}
-        
-        QUERY:
-        {query}
-        
-        RESPONSE:
-        """)
-        
-        chain = prompt | model
-        
-        result = chain.invoke({
+        result = await get_chain("response").ainvoke({
             "context": context,
             "query": state.query
         })
         
         state.response = result.content
-        print(f"최종 응답 생성: {state.response[:30]}...")
+        logger.debug("최종 응답 생성: %s...", state.response[:30])
     except Exception as e:
-        print(f"generate_response 함수 오류: {str(e)}")
+        logger.error("generate_response 함수 오류: %s", e)
         # Generate fallback response
         state.response = "죄송합니다만, 귀하의 요청을 처리하는 동안 오류가 발생했습니다. 나중에 다시 시도해 주세요."
     
     return state
 
+def install_uvloop() -> bool:
+    """Use uvloop as the asyncio event loop if it is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 def setup_openai_api() -> bool:
     """Set up and verify OpenAI API key"""
-    api_key = os.environ.get("OPENAI_API_KEY")
+    api_key = _API_KEY
     if not api_key:
         print("OPENAI_API_KEY를 찾을 수 없습니다.")
         print("다음 방법 중 하나로 API 키를 설정하세요:")
@@ -200,12 +316,12 @@ def setup_openai_api() -> bool:
     print(f"OpenAI API 키가 설정되었습니다: {api_key[:4]}...{api_key[-4:]}")
     return True
 
-def safe_invoke_workflow(workflow, query: str) -> str:
+async def safe_invoke_workflow(workflow, query: str) -> str:
     """Safely invoke a workflow with error handling"""
     try:
-        print(f"워크플로우 실행 중 - 쿼리: {query[:30]}...")
+        logger.debug("워크플로우 실행 중 - 쿼리: %s...", query[:30])
         state = State(query=query)
-        result = workflow.invoke(state)
+        result = await workflow.ainvoke(state)
         # result가 State 객체인지 확인
         if isinstance(result, State):
             response = result.response if hasattr(result, 'response') else "응답이 생성되지 않았습니다"
@@ -213,11 +329,31 @@ def safe_invoke_workflow(workflow, query: str) -> str:
             response = result['response']
         else:
             response = f"알 수 없는 응답 형식: {type(result)}"
-        print(f"워크플로우 완료 - 응답: {response[:30]}...")
+        logger.debug("워크플로우 완료 - 응답: %s...", response[:30])
         return response
     except Exception as e:
         error_msg = f"워크플로우 실행 오류: {str(e)}"
-        print(error_msg)
+        logger.error(error_msg)
+        return f"죄송합니다, 오류가 발생했습니다: {error_msg}"
+
+def parse_sections(content: str) -> Dict[str, str]:
+    """Split a reply formatted with '## Heading' lines into {heading: body}"""
+    parts = _SECTION_RE.split(content)
+    return {name.lower(): body.strip() for name, body in zip(parts[1::2], parts[2::2])}
+
+async def safe_fast_research(query: str) -> str:
+    """Answer a research query with a single LLM call, with error handling"""
+    try:
+        logger.debug("빠른 연구 쿼리 실행 중 - 쿼리: %s...", query[:30])
+        result = await get_chain("fast").ainvoke({"query": query})
+        sections = parse_sections(result.content)
+        # Fall back to the whole reply if the model ignored the section format
+        response = sections.get("response") or result.content
+        logger.debug("빠른 연구 쿼리 완료 - 응답: %s...", response[:30])
+        return response
+    except Exception as e:
+        error_msg = f"빠른 연구 쿼리 실행 오류: {str(e)}"
+        logger.error(error_msg)
         return f"죄송합니다, 오류가 발생했습니다: {error_msg}"
 
 def main():
@@ -225,18 +361,26 @@ def main():
     print("\n============================================")
     print("LangGraph GPT-4o-mini MCP 서버 시작 중...")
     print("============================================\n")
+
+    # Switch to uvloop before any model or event loop is created
+    if install_uvloop():
+        print("uvloop 이벤트 루프를 사용합니다")
     
     # Check for OpenAI API key
     if not setup_openai_api():
         return
         
+    # Debug mode turns on verbose PyMCP logs and the example's per-call debug logging
+    debug = True
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+
     # Create a PyMCP server with more robust error handling
     try:
         print("PyMCP 서버 생성 중...")
         server = PyMCP(
             name="LangGraph GPT-4o-mini Server",
             instructions="This server processes research queries through a multi-step workflow using LangGraph and GPT-4o-mini.",
-            debug=True  # Enable debug mode for more verbose logs
+            debug=debug,  # Enable debug mode for more verbose logs
         )
         print("PyMCP 서버 생성 완료!")
     except Exception as e:
@@ -269,15 +413,23 @@ def main():
         return
     
     @server.wrap_function(name="research_query", description="Process a research query through a multi-step workflow")
-    def research_query(query: str) -> str:
+    async def research_query(query: str) -> str:
         """Process a research query through a multi-step workflow."""
-        print(f"'research_query' 함수 호출됨: query={query[:30]}...")
-        result = safe_invoke_workflow(app, query)
+        logger.debug("'research_query' 함수 호출됨: query=%s...", query[:30])
+        result = await safe_invoke_workflow(app, query)
+        return result
+    
+    @server.wrap_function(name="fast_research_query", description="Answer a simple research query with a single LLM call")
+    async def fast_research_query(query: str) -> str:
+        """Answer a simple research query with a single LLM call instead of the multi-step workflow."""
+        logger.debug("'fast_research_query' 함수 호출됨: query=%s...", query[:30])
+        result = await safe_fast_research(query)
         return result
     
     print("\nLangGraph GPT-4o-mini MCP 서버가 시작되었습니다!")
     print("사용 가능한 도구:")
     print("1. research_query - 다단계 워크플로우를 통한 연구 쿼리 처리")
+    print("2. fast_research_query - 단일 LLM 호출로 간단한 연구 쿼리 처리")
     print("\n서버를 종료하려면 Ctrl+C를 누르세요")
     
     # Run the server with error handling
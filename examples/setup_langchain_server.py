@@ -13,7 +13,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from pymcp import add_pymcp_server, list_pymcp_servers
+    from pymcp import add_pymcp_servers, list_pymcp_servers
 except ImportError:
     print("오류: pymcp 패키지를 찾을 수 없습니다. 다음 명령어로 설치하세요: pip install pymcp")
     sys.exit(1)
@@ -22,7 +22,7 @@ def parse_arguments():
     """명령줄 인수를 파싱합니다"""
     parser = argparse.ArgumentParser(description="LangChain 및 LangGraph MCP 서버 설정 도구")
     parser.add_argument('--run', choices=['langchain', 'langgraph'], 
-                        help='지정된 서버를 등록 없이 바로 실행합니다')
+                        help='지정된 서버를 등록 없이 바로 실행합니다 (이 프로세스가 서버 프로세스로 대체됩니다)')
     parser.add_argument('--set-api-key', type=str, metavar='API_KEY',
                         help='OpenAI API 키를 스크립트 실행 중에만 설정합니다')
     parser.add_argument('--create-env', action='store_true',
@@ -63,7 +63,11 @@ def create_env_file(api_key=None):
         return False
 
 def run_server_directly(server_type, api_key=None, debug=False):
-    """지정된 서버를 직접 실행합니다"""
+    """지정된 서버를 직접 실행합니다
+
+    Windows가 아닌 환경에서는 os.execvpe로 현재 프로세스를 서버 프로세스로 대체하므로
+    성공 시 이 함수는 반환되지 않습니다.
+    """
     current_dir = os.path.dirname(os.path.abspath(__file__))
     
     if server_type == 'langchain':
@@ -84,19 +88,25 @@ def run_server_directly(server_type, api_key=None, debug=False):
         env["OPENAI_API_KEY"] = api_key
         print(f"OpenAI API 키가 설정되었습니다: {api_key[:4]}...{api_key[-4:]}")
     
-    # 실행 권한 부여
-    try:
-        os.chmod(script_path, 0o755)
-    except Exception as e:
-        print(f"경고: {script_path}에 실행 권한을 부여할 수 없습니다: {str(e)}")
+    # 실행 권한 부여 (이미 실행 가능하면 건너뜀)
+    if not os.access(script_path, os.X_OK):
+        try:
+            os.chmod(script_path, 0o755)
+        except Exception as e:
+            print(f"경고: {script_path}에 실행 권한을 부여할 수 없습니다: {str(e)}")
     
     # 서버 실행
     print(f"{server_type} 서버를 직접 실행합니다...")
     
     try:
         cmd = [sys.executable, script_path]
-        subprocess.run(cmd, env=env)
-        return True
+        if os.name == "nt":  # Windows has no exec that keeps the console
+            subprocess.run(cmd, env=env)
+            return True
+        # Replace this process with the server; control does not return here
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execvpe(sys.executable, cmd, env)
     except Exception as e:
         print(f"서버 실행 중 오류 발생: {str(e)}")
         return False
@@ -117,9 +127,9 @@ def register_servers():
         venv_python = os.path.join(venv_dir, "bin", "python")
         terminal_cmd = "osascript -e 'tell app \"Terminal\" to do script \""
 
-    # Make scripts executable
+    # Make scripts executable (skipping those that already are)
     for script in [langchain_path, langgraph_path]:
-        if os.path.exists(script):
+        if os.path.exists(script) and not os.access(script, os.X_OK):
             try:
                 os.chmod(script, 0o755)
             except Exception as e:
@@ -146,25 +156,24 @@ def register_servers():
         print("   export OPENAI_API_KEY='your-api-key'")
         print("\n등록을 계속합니다...\n")
 
-    # Register the LangChain Server
-    print("LangChain GPT-4o-mini MCP 서버를 Cursor에 추가하는 중...")
-    add_pymcp_server(
-        server_name="pymcp-langchain-gpt4o",
-        script_path=langchain_path,
-        python_path=venv_python,
-        working_dir=current_dir,
-        env_vars={"PYTHONPATH": current_dir}
-    )
-
-    # Register the LangGraph Server
-    print("LangGraph GPT-4o-mini MCP 서버를 Cursor에 추가하는 중...")
-    add_pymcp_server(
-        server_name="pymcp-langgraph-gpt4o",
-        script_path=langgraph_path,
-        python_path=venv_python,
-        working_dir=current_dir,
-        env_vars={"PYTHONPATH": current_dir}
-    )
+    # Register both servers with a single configuration write
+    print("LangChain 및 LangGraph GPT-4o-mini MCP 서버를 Cursor에 추가하는 중...")
+    add_pymcp_servers([
+        {
+            "server_name": "pymcp-langchain-gpt4o",
+            "script_path": langchain_path,
+            "python_path": venv_python,
+            "working_dir": current_dir,
+            "env_vars": {"PYTHONPATH": current_dir}
+        },
+        {
+            "server_name": "pymcp-langgraph-gpt4o",
+            "script_path": langgraph_path,
+            "python_path": venv_python,
+            "working_dir": current_dir,
+            "env_vars": {"PYTHONPATH": current_dir}
+        }
+    ])
 
     print("\n✅ MCP 서버가 Cursor 설정에 성공적으로 추가되었습니다!")
     print(f"설정 파일: {os.path.expanduser('~/.cursor/mcp.json')}")
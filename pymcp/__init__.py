@@ -1,19 +1,44 @@
 """PyMCP - A tool for converting regular Python functions to MCP servers"""
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from pymcp.converter import PyMCP, convert_function, mcpwrap
-from pymcp.utils import (
-    add_pymcp_server,
-    remove_pymcp_server,
-    list_pymcp_servers,
-    get_mcp_config_path
-)
+
+if TYPE_CHECKING:
+    from pymcp.utils import (
+        add_pymcp_server,
+        add_pymcp_servers,
+        remove_pymcp_server,
+        list_pymcp_servers,
+        get_mcp_config_path
+    )
+
+# Cursor configuration helpers are imported on first access
+_LAZY = {
+    "add_pymcp_server": "pymcp.utils",
+    "add_pymcp_servers": "pymcp.utils",
+    "remove_pymcp_server": "pymcp.utils",
+    "list_pymcp_servers": "pymcp.utils",
+    "get_mcp_config_path": "pymcp.utils",
+}
 
 __all__ = [
     "PyMCP", 
     "convert_function", 
     "mcpwrap",
     "add_pymcp_server",
+    "add_pymcp_servers",
     "remove_pymcp_server",
     "list_pymcp_servers",
     "get_mcp_config_path"
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        # Cache in the package namespace so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,76 +5,125 @@ PyMCP Command Line Interface
 
 import argparse
 import sys
-from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
-from pymcp.utils.cursor_config import (
-    add_pymcp_server,
-    remove_pymcp_server,
-    list_pymcp_servers,
-    get_mcp_config_path
-)
 
+def _add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the arguments of the cursor add-server command"""
+    parser.add_argument("name", help="Server name")
+    parser.add_argument("script", help="Script path")
+    parser.add_argument("--python", help="Python interpreter path")
+    parser.add_argument("--cwd", help="Working directory")
 
-def main():
-    """Main function for the pymcp command line interface"""
+
+def _remove_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the arguments of the cursor remove-server command"""
+    parser.add_argument("name", help="Server name")
+
+
+def _do_add_server(args: argparse.Namespace) -> int:
+    from pymcp.utils.cursor_config import add_pymcp_server
+
+    add_pymcp_server(args.name, args.script, args.python, args.cwd)
+    return 0
+
+
+def _do_remove_server(args: argparse.Namespace) -> int:
+    from pymcp.utils.cursor_config import remove_pymcp_server
+
+    success = remove_pymcp_server(args.name)
+    return 0 if success else 1
+
+
+def _do_list_servers(args: argparse.Namespace) -> int:
+    from pymcp.utils.cursor_config import list_pymcp_servers
+
+    list_pymcp_servers()
+    return 0
+
+
+def _do_config_path(args: argparse.Namespace) -> int:
+    from pymcp.utils.cursor_config import get_mcp_config_path
+
+    print(get_mcp_config_path())
+    return 0
+
+
+# cursor subcommands: name -> (help, argument builder, handler)
+_CURSOR_COMMANDS: Dict[str, Tuple[str, Optional[Callable[[argparse.ArgumentParser], None]], Callable[[argparse.Namespace], int]]] = {
+    "add-server": ("Add MCP server", _add_server_arguments, _do_add_server),
+    "remove-server": ("Remove MCP server", _remove_server_arguments, _do_remove_server),
+    "list-servers": ("List MCP servers", None, _do_list_servers),
+    "config-path": ("Show MCP configuration file path", None, _do_config_path),
+}
+
+
+def _sniff_subcommand(argv: List[str]) -> Optional[str]:
+    """Returns the command name from the arguments without full parsing"""
+    return argv[0] if argv and not argv[0].startswith("-") else None
+
+
+def _sniff_cursor_command(argv: List[str]) -> Optional[str]:
+    """Returns the cursor subcommand name from the arguments without full parsing"""
+    return argv[1] if len(argv) > 1 and not argv[1].startswith("-") else None
+
+
+def _build_parser(command: Optional[str], cursor_command: Optional[str]) -> Tuple[argparse.ArgumentParser, argparse.ArgumentParser]:
+    """Builds the argument parser, constructing only the subparsers the command line needs"""
     parser = argparse.ArgumentParser(description="PyMCP - A tool for converting regular Python functions to MCP servers")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
-    
+
     # cursor command and subcommands
     cursor_parser = subparsers.add_parser("cursor", help="Manage Cursor editor configuration")
     cursor_subparsers = cursor_parser.add_subparsers(dest="cursor_command", help="Cursor commands")
-    
-    # cursor add-server command
-    add_server_parser = cursor_subparsers.add_parser("add-server", help="Add MCP server")
-    add_server_parser.add_argument("name", help="Server name")
-    add_server_parser.add_argument("script", help="Script path")
-    add_server_parser.add_argument("--python", help="Python interpreter path")
-    add_server_parser.add_argument("--cwd", help="Working directory")
-    
-    # cursor remove-server command
-    remove_server_parser = cursor_subparsers.add_parser("remove-server", help="Remove MCP server")
-    remove_server_parser.add_argument("name", help="Server name")
-    
-    # cursor list-servers command
-    cursor_subparsers.add_parser("list-servers", help="List MCP servers")
-    
-    # cursor config-path command
-    cursor_subparsers.add_parser("config-path", help="Show MCP configuration file path")
-    
+
+    if command == "cursor":
+        # Build only the requested subcommand; fall back to all of them for
+        # `cursor --help` and unknown subcommands so help and errors list every choice
+        if cursor_command in _CURSOR_COMMANDS:
+            names = [cursor_command]
+        else:
+            names = list(_CURSOR_COMMANDS)
+        for name in names:
+            help_text, add_arguments, _ = _CURSOR_COMMANDS[name]
+            command_parser = cursor_subparsers.add_parser(name, help=help_text)
+            if add_arguments is not None:
+                add_arguments(command_parser)
+
     # Additional command groups can be added here
-    
+
+    return parser, cursor_parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the pymcp command line interface"""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    command = _sniff_subcommand(argv)
+    cursor_command = _sniff_cursor_command(argv) if command == "cursor" else None
+    parser, cursor_parser = _build_parser(command, cursor_command)
+
     # Parse command line arguments
-    args = parser.parse_args()
-    
+    args = parser.parse_args(argv)
+
     # Print help if no command specified
     if args.command is None:
         parser.print_help()
         return 1
-    
+
     # Process cursor commands
     if args.command == "cursor":
         if args.cursor_command is None:
             cursor_parser.print_help()
             return 1
-        
-        if args.cursor_command == "add-server":
-            add_pymcp_server(args.name, args.script, args.python, args.cwd)
-        elif args.cursor_command == "remove-server":
-            success = remove_pymcp_server(args.name)
-            return 0 if success else 1
-        elif args.cursor_command == "list-servers":
-            list_pymcp_servers()
-        elif args.cursor_command == "config-path":
-            print(get_mcp_config_path())
-        else:
-            cursor_parser.print_help()
-            return 1
-    else:
-        parser.print_help()
-        return 1
-    
-    return 0
+
+        _, _, handler = _CURSOR_COMMANDS[args.cursor_command]
+        return handler(args)
+
+    parser.print_help()
+    return 1
 
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
@@ -4,30 +4,41 @@ This module allows you to easily convert regular Python functions to MCP servers
 """
 
 import inspect
-import functools
-from typing import Any, Callable, Dict, List, Optional, Union, Literal, Sequence, Type, cast, get_type_hints, TypeVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union, Literal, Sequence, Tuple, TypeVar, TYPE_CHECKING
 
-from mcp.server.fastmcp import FastMCP
-from mcp.types import (
-    TextContent, 
-    ImageContent, 
-    EmbeddedResource,
-)
-from mcp.server.fastmcp.utilities.types import Image
+# The MCP SDK is imported lazily so that `import pymcp` (and the `pymcp cursor`
+# commands) don't pay for loading the FastMCP server stack
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import Context, FastMCP
+    from mcp.types import (
+        TextContent, 
+        ImageContent, 
+        EmbeddedResource,
+    )
+    from mcp.server.fastmcp.utilities.types import Image
 
 # Type definitions
 FunctionType = Callable[..., Any]
-McpResultType = Sequence[Union[TextContent, ImageContent, EmbeddedResource]]
+McpResultType = Sequence[Union["TextContent", "ImageContent", "EmbeddedResource"]]
 
 # Type for decorator functions
 F = TypeVar('F', bound=Callable[..., Any])
 
+# Keyword-only parameter added to async generator tools that don't take a Context
+# themselves, so FastMCP injects one for streaming chunks
+STREAM_CONTEXT_PARAM = "pymcp_context"
+
 class PyMCP:
     """
     Class for converting regular Python functions to MCP servers.
     This class allows you to combine multiple functions into one MCP server.
     """
     
+    # MCP types, imported on first conversion. _MCP_TYPES holds the content types passed
+    # through unchanged, in the order (TextContent, ImageContent, EmbeddedResource)
+    _MCP_TYPES: Tuple[type, ...] = ()
+    _IMAGE_TYPE: Optional[type] = None
+    
     def __init__(self, name: str = "PyMCP Server", instructions: Optional[str] = None, **kwargs: Any):
         """
         Initialize a PyMCP server.
@@ -37,12 +48,18 @@ class PyMCP:
             instructions: Server usage instructions (optional)
             **kwargs: Additional settings to pass to FastMCP
         """
+        from mcp.server.fastmcp import FastMCP
+        
         self.mcp = FastMCP(name=name, instructions=instructions, **kwargs)
         self.functions: Dict[str, FunctionType] = {}
     
     def add_function(self, func: FunctionType, name: Optional[str] = None, description: Optional[str] = None) -> None:
         """
         Add a regular Python function to the MCP server as a tool.
+        Both regular functions and coroutine functions (``async def``) are supported.
+        Async generator functions are streamed: each yielded chunk is sent to the client
+        as a progress notification as soon as it is produced, and the joined chunks are
+        returned as the tool result.
         
         Args:
             func: Python function to register
@@ -50,18 +67,190 @@ class PyMCP:
             description: Tool description (defaults to function docstring)
         """
         func_name = name or func.__name__
-        func_description = description or inspect.getdoc(func) or f"Function {func_name}"
+        func_description = description or self._get_doc(func) or f"Function {func_name}"
         
-        # Create a wrapper function that converts function results to MCP-compatible format
-        @functools.wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> McpResultType:
-            result = func(*args, **kwargs)
-            return self._convert_to_mcp_format(result)
+        wrapper = self._make_wrapper(func)
         
         # Register the wrapper function as an MCP tool
         self.mcp.add_tool(wrapper, name=func_name, description=func_description)
         self.functions[func_name] = func
     
+    @staticmethod
+    def _get_doc(func: Callable[..., Any]) -> Optional[str]:
+        """
+        Return the cleaned docstring of func, caching it on the function object.
+        
+        Args:
+            func: Python function to inspect
+            
+        Returns:
+            Docstring with indentation cleaned up, or None if there is none
+        """
+        raw_doc = getattr(func, "__doc__", None)
+        if raw_doc is None:
+            # inspect.getdoc may fall back to an inherited docstring, which can change
+            # without func changing, so this case isn't cached
+            return inspect.getdoc(func)
+        
+        # The cache holds (raw docstring, cleaned docstring); read it from func's own
+        # namespace so subclasses don't inherit it, and drop it once __doc__ changes
+        try:
+            cached = vars(func).get("_pymcp_doc")
+        except TypeError:
+            cached = None
+        if cached is not None and cached[0] == raw_doc:
+            return cached[1]
+        
+        doc = inspect.getdoc(func)
+        try:
+            func._pymcp_doc = (raw_doc, doc)  # type: ignore[attr-defined]
+        except (AttributeError, TypeError):
+            # Builtins and bound methods don't accept new attributes
+            pass
+        return doc
+    
+    @staticmethod
+    def _tool_signature(func: Callable[..., Any]) -> inspect.Signature:
+        """
+        Return the signature FastMCP should see for the tool wrapping func.
+        
+        The wrapper returns converted MCP content rather than func's declared return type,
+        so the return annotation is dropped; otherwise FastMCP builds an output schema from
+        it and rejects the content list.
+        
+        Args:
+            func: Python function being registered
+            
+        Returns:
+            func's signature without a return annotation
+        """
+        try:
+            signature = inspect.signature(func, eval_str=True)
+        except NameError:
+            signature = inspect.signature(func)
+        return signature.replace(return_annotation=inspect.Signature.empty)
+    
+    @staticmethod
+    def _add_context_param(signature: inspect.Signature, name: str, context_type: type) -> inspect.Signature:
+        """
+        Return signature with a keyword-only Context parameter added.
+        
+        Args:
+            signature: Tool signature to extend
+            name: Name of the new parameter
+            context_type: FastMCP Context class used as its annotation
+            
+        Returns:
+            Signature that FastMCP will inject a Context into
+        """
+        params = list(signature.parameters.values())
+        context = inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=context_type)
+        # Keyword-only parameters must come before **kwargs
+        if params and params[-1].kind is inspect.Parameter.VAR_KEYWORD:
+            params.insert(-1, context)
+        else:
+            params.append(context)
+        return signature.replace(parameters=params)
+    
+    @staticmethod
+    async def _stream_chunks(chunks: AsyncIterator[Any], ctx: Optional["Context"]) -> str:
+        """
+        Consume an async generator tool, forwarding each chunk to the client as it arrives.
+        
+        Args:
+            chunks: Async iterator returned by the tool function
+            ctx: FastMCP context of the current request, if any
+            
+        Returns:
+            All chunks joined into one string
+        """
+        # Progress notifications need a live request; calls made outside one
+        # (e.g. FastMCP.call_tool from a script) just collect the chunks
+        try:
+            ctx.request_context  # type: ignore[union-attr]
+        except (AttributeError, ValueError):
+            ctx = None
+        
+        parts = []
+        async for chunk in chunks:
+            text = str(chunk)
+            parts.append(text)
+            if ctx is not None:
+                # Sent only when the client asked for progress with a progress token
+                await ctx.report_progress(len(parts), message=text)
+        return "".join(parts)
+    
+    def _make_wrapper(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Build the function registered with FastMCP, which calls func and converts its result.
+        
+        Args:
+            func: Python function to wrap
+            
+        Returns:
+            Wrapper function that returns MCP-compatible content
+        """
+        # Bind the converter once so each call skips the attribute lookup on self
+        _convert = self._convert_to_mcp_format
+        _stream = self._stream_chunks
+        signature = self._tool_signature(func)
+        context_param: Optional[str] = None
+        
+        # Coroutine functions get an async wrapper so FastMCP awaits them on its event loop
+        if inspect.iscoroutinefunction(func):
+            async def wrapper(*args: Any, **kwargs: Any) -> McpResultType:
+                return _convert(await func(*args, **kwargs))
+        elif inspect.isasyncgenfunction(func):
+            from mcp.server.fastmcp import Context
+            
+            # Reuse func's own Context parameter if it has one, otherwise add ours
+            ctx_name = next((
+                param.name for param in signature.parameters.values()
+                if inspect.isclass(param.annotation) and issubclass(param.annotation, Context)
+            ), None)
+            if ctx_name is None:
+                ctx_name = context_param = STREAM_CONTEXT_PARAM
+                signature = self._add_context_param(signature, context_param, Context)
+            
+            async def wrapper(*args: Any, **kwargs: Any) -> McpResultType:
+                ctx = kwargs.get(ctx_name) if context_param is None else kwargs.pop(ctx_name, None)
+                return _convert(await _stream(func(*args, **kwargs), ctx))
+        else:
+            def wrapper(*args: Any, **kwargs: Any) -> McpResultType:
+                return _convert(func(*args, **kwargs))
+        
+        # Copy only the metadata FastMCP consults instead of everything functools.wraps copies;
+        # __wrapped__ lets inspect.signature report the original parameters
+        wrapper.__wrapped__ = func  # type: ignore[attr-defined]
+        wrapper.__name__ = getattr(func, "__name__", wrapper.__name__)
+        wrapper.__qualname__ = getattr(func, "__qualname__", wrapper.__qualname__)
+        wrapper.__doc__ = func.__doc__
+        wrapper.__module__ = getattr(func, "__module__", wrapper.__module__)
+        wrapper.__annotations__ = dict(getattr(func, "__annotations__", {}))
+        
+        wrapper.__signature__ = signature  # type: ignore[attr-defined]
+        wrapper.__annotations__.pop("return", None)
+        if context_param is not None:
+            # FastMCP finds the Context parameter through the wrapper's type hints
+            wrapper.__annotations__[context_param] = signature.parameters[context_param].annotation
+        
+        return wrapper
+    
+    @classmethod
+    def _load_mcp_types(cls) -> Tuple[type, ...]:
+        """
+        Import the MCP content types and cache them on the class.
+        
+        Returns:
+            Tuple of (TextContent, ImageContent, EmbeddedResource)
+        """
+        from mcp.types import TextContent, ImageContent, EmbeddedResource
+        from mcp.server.fastmcp.utilities.types import Image
+        
+        cls._IMAGE_TYPE = Image
+        cls._MCP_TYPES = (TextContent, ImageContent, EmbeddedResource)
+        return cls._MCP_TYPES
+    
     def _convert_to_mcp_format(self, result: Any) -> McpResultType:
         """
         Convert function result to MCP-compatible format.
@@ -72,19 +261,25 @@ class PyMCP:
         Returns:
             Result converted to MCP-compatible format
         """
+        content_types = self._MCP_TYPES or self._load_mcp_types()
+        
         # If already in MCP-compatible format, return as is
-        if isinstance(result, (TextContent, ImageContent, EmbeddedResource)) or (
-            isinstance(result, list) and all(isinstance(item, (TextContent, ImageContent, EmbeddedResource)) for item in result)
-        ):
-            return result if isinstance(result, list) else [result]
+        if isinstance(result, content_types):
+            return [result]
+        # Check the first item before scanning the whole list
+        if type(result) is list and (not result or (
+            isinstance(result[0], content_types) and all(isinstance(item, content_types) for item in result)
+        )):
+            return result
         
         # Handle image objects
-        if isinstance(result, Image):
-            return [ImageContent(type="image", data=result.data, mimeType=result.mime_type)]
+        if isinstance(result, self._IMAGE_TYPE):
+            image_content_type = content_types[1]
+            return [image_content_type(type="image", data=result.data, mimeType=result.mime_type)]
         
         # Convert to text and return
-        text_result = str(result)
-        return [TextContent(type="text", text=text_result)]
+        text_content_type = content_types[0]
+        return [text_content_type(type="text", text=str(result))]
     
     def run(self, transport: Literal["stdio", "sse"] = "stdio") -> None:
         """
@@ -153,17 +348,23 @@ def mcpwrap(name: Optional[str] = None, description: Optional[str] = None,
         Decorator that takes a function and converts it to an MCP server
     """
     def decorator(func: F) -> F:
+        cached: Optional[PyMCP] = None
+        
+        def build() -> PyMCP:
+            # Build the server on first use and reuse it afterwards
+            nonlocal cached
+            if cached is None:
+                cached = convert_function(
+                    func, name=name, description=description,
+                    server_name=server_name, instructions=instructions, **kwargs
+                )
+            return cached
+        
         # Add MCP server creation function to function attributes
-        setattr(func, '_pymcp_convert', lambda: convert_function(
-            func, name=name, description=description,
-            server_name=server_name, instructions=instructions, **kwargs
-        ))
+        setattr(func, '_pymcp_convert', build)
         
         # Add run function to function attributes
-        setattr(func, 'serve_mcp', lambda transport="stdio": convert_function(
-            func, name=name, description=description,
-            server_name=server_name, instructions=instructions, **kwargs
-        ).run(transport=transport))
+        setattr(func, 'serve_mcp', lambda transport="stdio": build().run(transport=transport))
         
         return func
     
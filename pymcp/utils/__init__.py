@@ -1,16 +1,33 @@
 """PyMCP utility modules"""
 
-# Import utility functions related to cursor
-from pymcp.utils.cursor_config import (
-    add_pymcp_server,
-    remove_pymcp_server,
-    list_pymcp_servers,
-    get_mcp_config_path
-)
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = [
-    "add_pymcp_server",
-    "remove_pymcp_server",
-    "list_pymcp_servers",
-    "get_mcp_config_path"
-] 
\ No newline at end of file
+if TYPE_CHECKING:
+    from pymcp.utils.cursor_config import (
+        add_pymcp_server,
+        add_pymcp_servers,
+        remove_pymcp_server,
+        list_pymcp_servers,
+        get_mcp_config_path
+    )
+
+# Utility functions related to cursor, imported from their module on first access
+_LAZY = {
+    "add_pymcp_server": "pymcp.utils.cursor_config",
+    "add_pymcp_servers": "pymcp.utils.cursor_config",
+    "remove_pymcp_server": "pymcp.utils.cursor_config",
+    "list_pymcp_servers": "pymcp.utils.cursor_config",
+    "get_mcp_config_path": "pymcp.utils.cursor_config",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        # Cache in the module namespace so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,86 +2,136 @@
 Utility module for creating MCP server configuration files for Cursor editor.
 """
 
+import functools
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 
+try:  # Optional: faster JSON parsing and serialization
+    import orjson
+except ImportError:
+    orjson = None
 
+
+# Cursor configuration directory relative to the home directory
+if sys.platform == "darwin":  # macOS
+    _CURSOR_DIR_PARTS = (".cursor",)
+elif sys.platform == "win32":  # Windows
+    _CURSOR_DIR_PARTS = ("AppData", "Roaming", "cursor")
+else:  # Linux and other platforms
+    _CURSOR_DIR_PARTS = (".config", "cursor")
+
+
+@functools.lru_cache(maxsize=1)
 def get_cursor_config_dir() -> Path:
     """Returns the Cursor configuration directory path."""
-    if sys.platform == "darwin":  # macOS
-        return Path.home() / ".cursor"
-    elif sys.platform == "win32":  # Windows
-        return Path.home() / "AppData" / "Roaming" / "cursor"
-    else:  # Linux and other platforms
-        return Path.home() / ".config" / "cursor"
+    return Path.home().joinpath(*_CURSOR_DIR_PARTS)
 
 
+@functools.lru_cache(maxsize=1)
 def get_mcp_config_path() -> Path:
     """Returns the MCP configuration file path."""
     return get_cursor_config_dir() / "mcp.json"
 
 
-def read_mcp_config() -> Dict[str, Any]:
-    """Reads existing MCP configuration."""
-    config_path = get_mcp_config_path()
-    if not config_path.exists():
+def _json_loads(data: bytes) -> Any:
+    """Parses JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(config: Dict[str, Any]) -> bytes:
+    """Serializes configuration to indented JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, indent=2).encode("utf-8")
+
+
+# Raw contents of the last configuration file read or written, keyed by its
+# (path, mtime in ns, size); parsing the bytes gives every caller a fresh dict
+_CONFIG_CACHE: Optional[Tuple[Tuple[Path, int, int], bytes]] = None
+
+
+def read_mcp_config(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Reads existing MCP configuration.
+    
+    The file contents are cached while the file is unchanged. Each call parses
+    them into a new dict, so callers may modify the result freely.
+    
+    Args:
+        path: Configuration file path (default: get_mcp_config_path())
+    """
+    global _CONFIG_CACHE
+    config_path = path if path is not None else get_mcp_config_path()
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
         # Return default structure
         return {"mcpServers": {}}
     
-    with open(config_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    cache_key = (config_path, stat.st_mtime_ns, stat.st_size)
+    if _CONFIG_CACHE is not None and _CONFIG_CACHE[0] == cache_key:
+        data = _CONFIG_CACHE[1]
+    else:
+        data = config_path.read_bytes()
+        _CONFIG_CACHE = (cache_key, data)
+    
+    return _json_loads(data) if data.strip() else {"mcpServers": {}}
 
 
-def write_mcp_config(config: Dict[str, Any]) -> None:
-    """Writes MCP configuration to file."""
-    config_path = get_mcp_config_path()
+def write_mcp_config(config: Dict[str, Any], path: Optional[Path] = None) -> None:
+    """Writes MCP configuration to file.
+    
+    Args:
+        config: Configuration to write
+        path: Configuration file path (default: get_mcp_config_path())
+    """
+    global _CONFIG_CACHE
+    config_path = path if path is not None else get_mcp_config_path()
     
     # Create configuration directory if it doesn't exist
-    config_dir = get_cursor_config_dir()
-    if not config_dir.exists():
-        config_dir.mkdir(parents=True, exist_ok=True)
+    config_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2)
+    # Write to a temporary file and swap it in, so Cursor never reads a half-written file.
+    # Replace the symlink target rather than the link, so dotfile-managed configs keep working
+    target_path = config_path.resolve()
+    tmp_path = target_path.with_name(target_path.name + ".tmp")
+    data = _json_dumps(config)
+    tmp_path.write_bytes(data)
+    # Keep the permissions of the file being replaced instead of the umask default
+    try:
+        os.chmod(tmp_path, target_path.stat().st_mode & 0o7777)
+    except FileNotFoundError:
+        pass
+    os.replace(tmp_path, target_path)
+    
+    # Cache the bytes just written so the next read doesn't have to read them back
+    stat = config_path.stat()
+    _CONFIG_CACHE = ((config_path, stat.st_mtime_ns, stat.st_size), data)
 
 
-def add_pymcp_server(
-    server_name: str, 
+def _build_server_config(
     script_path: str, 
     python_path: Optional[str] = None,
     working_dir: Optional[str] = None,
     env_vars: Optional[Dict[str, str]] = None
-) -> None:
-    """Adds a PyMCP server to the Cursor MCP configuration.
-    
-    Args:
-        server_name: MCP server name
-        script_path: Path to the Python script to execute
-        python_path: Path to the Python interpreter (default: system Python)
-        working_dir: Working directory (default: script directory)
-        env_vars: Environment variables (default: includes PYTHONPATH)
-    """
-    # Convert to absolute path
-    script_path = os.path.abspath(script_path)
+) -> Dict[str, Any]:
+    """Builds the Cursor MCP configuration entry for a PyMCP server."""
+    # Make paths absolute once and derive the rest from them. abspath doesn't follow
+    # symlinks, so a linked script keeps its own directory (and that directory's .venv)
+    script = Path(os.path.abspath(script_path))
     
     # Use script directory as working directory if not specified
-    if working_dir is None:
-        working_dir = os.path.dirname(script_path)
-    else:
-        working_dir = os.path.abspath(working_dir)
+    wd = Path(os.path.abspath(working_dir)) if working_dir is not None else script.parent
     
     # Determine Python interpreter path
     if python_path is None:
-        # Try to use virtual environment Python
-        venv_path = os.path.join(working_dir, '.venv', 'bin', 'python')
-        if os.path.exists(venv_path):
-            python_path = venv_path
-        else:
-            # Use system Python
-            python_path = "python"
+        # Try to use virtual environment Python, falling back to system Python
+        venv_python = wd / ".venv" / "bin" / "python"
+        python_path = str(venv_python) if venv_python.exists() else "python"
     
     # Set environment variables
     if env_vars is None:
@@ -89,24 +139,65 @@ def add_pymcp_server(
     
     # Add working directory to PYTHONPATH
     if "PYTHONPATH" not in env_vars:
-        env_vars["PYTHONPATH"] = working_dir
+        env_vars["PYTHONPATH"] = str(wd)
     
-    # Read existing configuration
-    config = read_mcp_config()
-    
-    # Add server configuration
-    config["mcpServers"][server_name] = {
+    return {
         "command": python_path,
-        "args": [script_path],
-        "cwd": working_dir,
+        "args": [str(script)],
+        "cwd": str(wd),
         "env": env_vars
     }
+
+
+def add_pymcp_servers(servers: List[Dict[str, Any]]) -> None:
+    """Adds several PyMCP servers to the Cursor MCP configuration with a single write.
+    
+    Args:
+        servers: Server definitions, each a dict with the keyword arguments of
+            add_pymcp_server (server_name, script_path and optionally python_path,
+            working_dir, env_vars)
+    """
+    # Read existing configuration
+    cfg_path = get_mcp_config_path()
+    config = read_mcp_config(cfg_path)
+    
+    # Add server configurations
+    for server in servers:
+        options = dict(server)
+        server_name = options.pop("server_name")
+        config["mcpServers"][server_name] = _build_server_config(**options)
     
     # Save configuration
-    write_mcp_config(config)
+    write_mcp_config(config, cfg_path)
+    
+    for server in servers:
+        print(f"Added '{server['server_name']}' server to Cursor MCP configuration.")
+    print(f"Configuration file location: {cfg_path}")
+
+
+def add_pymcp_server(
+    server_name: str, 
+    script_path: str, 
+    python_path: Optional[str] = None,
+    working_dir: Optional[str] = None,
+    env_vars: Optional[Dict[str, str]] = None
+) -> None:
+    """Adds a PyMCP server to the Cursor MCP configuration.
     
-    print(f"Added '{server_name}' server to Cursor MCP configuration.")
-    print(f"Configuration file location: {get_mcp_config_path()}")
+    Args:
+        server_name: MCP server name
+        script_path: Path to the Python script to execute
+        python_path: Path to the Python interpreter (default: system Python)
+        working_dir: Working directory (default: script directory)
+        env_vars: Environment variables (default: includes PYTHONPATH)
+    """
+    add_pymcp_servers([{
+        "server_name": server_name,
+        "script_path": script_path,
+        "python_path": python_path,
+        "working_dir": working_dir,
+        "env_vars": env_vars
+    }])
 
 
 def remove_pymcp_server(server_name: str) -> bool:
@@ -119,7 +210,8 @@ def remove_pymcp_server(server_name: str) -> bool:
         bool: Whether removal was successful
     """
     # Read existing configuration
-    config = read_mcp_config()
+    cfg_path = get_mcp_config_path()
+    config = read_mcp_config(cfg_path)
     
     # Check if server exists
     if server_name not in config["mcpServers"]:
@@ -130,7 +222,7 @@ def remove_pymcp_server(server_name: str) -> bool:
     del config["mcpServers"][server_name]
     
     # Save configuration
-    write_mcp_config(config)
+    write_mcp_config(config, cfg_path)
     
     print(f"Removed '{server_name}' server from Cursor MCP configuration.")
     return True
@@ -139,11 +231,13 @@ def remove_pymcp_server(server_name: str) -> bool:
 def list_pymcp_servers() -> List[str]:
     """Returns a list of servers registered in the Cursor MCP configuration."""
     config = read_mcp_config()
-    servers = list(config["mcpServers"].keys())
+    servers = list(config["mcpServers"])
     
-    print("Servers registered in Cursor MCP configuration:")
-    for server in servers:
-        print(f"- {server}")
+    # Emit the whole listing in one write instead of one print per server
+    output = "Servers registered in Cursor MCP configuration:\n"
+    if servers:
+        output += "- " + "\n- ".join(servers) + "\n"
+    sys.stdout.write(output)
     
     return servers
 